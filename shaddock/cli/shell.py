@@ -128,6 +128,16 @@ class ShaddockShell(App):
                              default=None),
             help='The cluster to use (No value is all by default).'
         )
+        parser.add_argument(
+            '--build-workers',
+            action='store',
+            dest='shdk_build_workers',
+            type=int,
+            default=self.env('SHDK_BUILD_WORKERS',
+                             default=1),
+            help='Number of images built at the same time by the build'
+                 ' command (Images are built one by one by default).'
+        )
         return parser
 
     def initialize_app(self, argv):
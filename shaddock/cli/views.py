@@ -53,8 +53,7 @@ class Cycle(Command):
     def take_action(self, parsed_args):
         schedul = Scheduler(self.app_args, parsed_args.name)
         schedul.cycle()
-        model = ModelDefinition(self.app_args.shdk_model, self.app_args)
-        svc_cfg = model.get_service(parsed_args.name)
+        svc_cfg = schedul.model.get_service(parsed_args.name)
         container = Container(svc_cfg)
         container.return_logs()
 
@@ -270,7 +269,7 @@ def get_service_info(self, parsed_args):
     columns = ()
     if name is None:
         for svc in model.get_services_list():
-            c = Container(model.get_service(svc['name']))
+            c = Container(model.build_service_dict(svc))
             columns = columns + (svc['name'], )
             status = c.info.get('Status')
             data = data + (status, )
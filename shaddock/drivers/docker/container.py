@@ -19,6 +19,11 @@ from shaddock.drivers.docker.api import DockerApi
 from docker import errors as docker_errors
 import sys
 
+# Service definition keys that are not Docker API arguments.
+ARGS_TO_DELETE = frozenset(['priority', 'depends-on', 'detach', 'api_cfg',
+                            'cluster', 'images_dir', 'path', 'service_name',
+                            'host'])
+
 
 class Container(object):
     """Instance a defined container
@@ -35,18 +40,11 @@ class Container(object):
 
     def __init__(self, svc_cfg, containers_all=None):
         self.cfg = svc_cfg
-        self.env = dict(self.cfg)
         # we may want to use func.__code__.co_varnames here to gather all
         # possible arguments of the docker api and compare them with cfg
-        # and delete the crapy hack of the next 8 lines.
-        args_to_delete = ['priority', 'depends-on', 'detach', 'api_cfg',
-                          'cluster', 'images_dir', 'path', 'service_name',
-                          'host']
-        for arg in args_to_delete:
-            try:
-                del self.env[arg]
-            except KeyError:
-                pass
+        # and delete the crapy hack of ARGS_TO_DELETE.
+        self.env = {arg: value for arg, value in self.cfg.items()
+                    if arg not in ARGS_TO_DELETE}
         self.env['detach'] = self.cfg.get('detach', True)
         self.docker_client = None
         if containers_all is None:
@@ -147,13 +145,10 @@ class Container(object):
             container = [c for c in containers_all
                          if (c.name in self.cfg['service_name'])][0]
 
-            api = DockerApi(self.cfg['api_cfg'], 'lowlevelapi')
-            api = api.connect()
-            infos = api.inspect_container(container.id)
-
+            # The listed containers already carry their inspect data.
             info['Container'] = container
             info['Id'] = container.id
-            info['Ip'] = infos['NetworkSettings']['IPAddress']
+            info['Ip'] = container.attrs['NetworkSettings']['IPAddress']
             info['State'] = container.status
 
         except IndexError:
@@ -27,7 +27,7 @@ class Image(object):
         self.docker_client = docker_api.connect()
 
     def build(self, nocache=None):
-        print("Building image %s" % self.cfg['image']),
+        print("Building image {}".format(self.cfg['image']))
         image = self.docker_client.images.build(
             path=self.cfg['path'],
             tag=self.cfg['image'],
@@ -56,7 +56,7 @@ class Image(object):
         return image
 
     def pull(self):
-        sys.stdout.write("Pulling image %s:" % self.cfg['image']),
+        sys.stdout.write("Pulling image {}:".format(self.cfg['image']))
         sys.stdout.flush()
         for line in self.docker_client.pull(self.cfg['image'], stream=True):
             tick = '*'
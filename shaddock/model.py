@@ -17,8 +17,21 @@
 
 from jinja2 import Template
 import os.path
+from past.builtins import basestring
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Parsed yaml files by absolute path, along with the modification time of
+# every file read to build them (the file itself and its includes).
+_YAML_CACHE = {}
+
+# Compiled jinja2 templates, keyed by their source.
+_TEMPLATE_CACHE = {}
+
 
 class ModelDefinition(object):
     """Container definition
@@ -44,13 +57,15 @@ class ModelDefinition(object):
         self.cluster_name = cluster_name
         if app_args and app_args.shdk_cluster:
             self.cluster_name = app_args.shdk_cluster
+        self._services_list = None
+        self._services_index = None
+        self._clusters_index = None
 
         Loader.add_constructor('!include', Loader.include)
         # Services are first imported as single string
         # They are then re loaded from yaml after jinja2.
         # Loader.add_constructor('services:', Loader.import_str)
-        with open(self.model) as f:
-            model = yaml.load(f, Loader)
+        model = _load_yaml_cached(self.model)
 
         self.cluster_list = []
         if model.get('projects') is not None:
@@ -66,21 +81,24 @@ class ModelDefinition(object):
         """Return a cluster object by its name
 
         """
-        try:
-            cluster = [clu for clu in self.cluster_list if clu['name'] == name]
-            if len(cluster) > 1:
+        if self._clusters_index is None:
+            try:
+                self._clusters_index = _index_by_name(self.cluster_list)
+            except KeyError:
                 raise TemplateFileError(
-                    "There is more than one definition matching"
-                    " 'name: {}' in your model".format(name))
-            cluster = cluster[0]
-        except IndexError:
+                    "At least one cluster definition "
+                    "is missing the name property")
+        clusters, duplicates = self._clusters_index
+        if name in duplicates:
             raise TemplateFileError(
-                "There is no cluster definition containing"
+                "There is more than one definition matching"
                 " 'name: {}' in your model".format(name))
+        try:
+            cluster = clusters[name]
         except KeyError:
             raise TemplateFileError(
-                "At least one cluster definition "
-                "is missing the name property")
+                "There is no cluster definition containing"
+                " 'name: {}' in your model".format(name))
         return cluster
 
     def _get_cluster_services(self, cluster):
@@ -88,23 +106,27 @@ class ModelDefinition(object):
 
         """
         services_list = []
+        services = cluster['services']
         if ('vars' in cluster):
+            # Services defined as a single string are a jinja2 template of
+            # the services yaml. Already parsed services only have their
+            # strings rendered.
             try:
-                j2 = Template(str(cluster['services']))
-                services_yaml = j2.render(cluster['vars'])
-                services = yaml.load(services_yaml)
+                services = _render(services, cluster['vars'])
             except ValueError:
-                for l in cluster['vars']:
-                    j2 = Template(str(cluster['services']))
-                    services_yaml = j2.render(l)
-                    services = yaml.load(services_yaml)
-            cluster['services'] = services
-
-        for service in cluster['services']:
+                for variables in cluster['vars']:
+                    services = _render(cluster['services'], variables)
+            if isinstance(services, basestring):
+                services = yaml.load(services, Loader=SafeLoader)
+
+        hosts_index = _index_hosts(cluster.get('hosts'))
+        for service in services:
+            service = dict(service)
             service['cluster'] = {}
             service['cluster']['images'] = cluster['images']
             service['cluster']['name'] = cluster['name']
             service['cluster']['hosts'] = cluster.get('hosts')
+            service['cluster']['hosts_index'] = hosts_index
             service['cluster']['vars'] = cluster.get('vars')
             services_list.append(service)
         return services_list
@@ -112,16 +134,19 @@ class ModelDefinition(object):
     def get_services_list(self):
         """This method returns a service list as a dict list.
 
+        The list is only computed once per model instance, as rendering
+        the clusters services is expensive.
         """
-        if self.cluster_name is None:
-            svc_list = []
-            for clu in self.cluster_list:
-                clu_svc_list = self._get_cluster_services(clu)
-                svc_list = svc_list + clu_svc_list
-        else:
-            cluster = self.get_cluster(self.cluster_name)
-            svc_list = self._get_cluster_services(cluster)
-        return svc_list
+        if self._services_list is None:
+            if self.cluster_name is None:
+                svc_list = []
+                for clu in self.cluster_list:
+                    svc_list.extend(self._get_cluster_services(clu))
+            else:
+                cluster = self.get_cluster(self.cluster_name)
+                svc_list = self._get_cluster_services(cluster)
+            self._services_list = svc_list
+        return list(self._services_list)
 
     def get_service(self, name):
         """This method returns a service as a dict.
@@ -129,23 +154,25 @@ class ModelDefinition(object):
         It can only return a service from a specific cluster.
         A service name is allowed only once per cluster.
         """
-        services_list = self.get_services_list()
-
-        try:
-            service = [svc for svc in services_list if svc['name'] == name]
-            if len(service) > 1:
+        if self._services_index is None:
+            try:
+                self._services_index = _index_by_name(
+                    self.get_services_list())
+            except KeyError:
                 raise TemplateFileError(
-                    "There is more than one definition matching"
-                    " 'name: {}' in this cluster".format(name))
-            service = service[0]
-        except IndexError:
+                    "At least one container definition in your model"
+                    " is missing the name property")
+        services, duplicates = self._services_index
+        if name in duplicates:
             raise TemplateFileError(
-                "There is no container definition containing"
-                " 'name: {}' in your model".format(name))
+                "There is more than one definition matching"
+                " 'name: {}' in this cluster".format(name))
+        try:
+            service = services[name]
         except KeyError:
             raise TemplateFileError(
-                "At least one container definition in your model"
-                " is missing the name property")
+                "There is no container definition containing"
+                " 'name: {}' in your model".format(name))
 
         service = self.build_service_dict(service)
         return service
@@ -153,7 +180,10 @@ class ModelDefinition(object):
     def build_service_dict(self, service):
         """Build a service dictionary
 
+        A new dictionary is returned, the services of the model are not
+        modified so that they can be built several times.
         """
+        service = dict(service)
         # Image dir definition:
         #
         try:
@@ -180,22 +210,22 @@ class ModelDefinition(object):
         # Host API Definition:
         #
         api_cfg = {}
-        try:
-            api_cfg = [api for api in service['cluster']['hosts'] if
-                       api['name'] == service['host']]
-            if len(api_cfg) > 1:
+        if 'hosts_index' in service['cluster']:
+            hosts_index = service['cluster']['hosts_index']
+        else:
+            hosts_index = _index_hosts(service['cluster']['hosts'])
+        if 'host' in service and hosts_index is not None:
+            hosts, duplicates = hosts_index
+            if service['host'] in duplicates:
                 raise TemplateFileError(
                     "There is more than one definition matching"
                     " 'name: {}' in your model".format(service['name']))
-            api_cfg = api_cfg[0]
-        except KeyError:
-            pass
-        except IndexError:
-            raise TemplateFileError(
-                "There is no Docker Host definition containing"
-                " 'name: {}' in your model.".format(service['host']))
-        except TypeError:
-            pass
+            try:
+                api_cfg = hosts[service['host']]
+            except KeyError:
+                raise TemplateFileError(
+                    "There is no Docker Host definition containing"
+                    " 'name: {}' in your model.".format(service['host']))
         service['api_cfg'] = api_cfg
         return service
 
@@ -204,21 +234,23 @@ class TemplateFileError(Exception):
     pass
 
 
-class Loader(yaml.Loader):
+class Loader(SafeLoader):
     """Include
 
     This class change the Yaml Load fct to allow file inclusion
     using the !include keywork.
     """
     def __init__(self, stream):
-        self._root = os.path.split(stream.name)[0]
+        self._root = os.path.dirname(stream.name)
+        self._mtimes = {}
         super(Loader, self).__init__(stream)
 
     def include(self, node):
         filename = os.path.join(self._root, self.construct_scalar(node))
         # try:
-        with open(filename, 'r') as f:
-            return yaml.load(f, Loader)
+        data, mtimes = _load_yaml(os.path.abspath(filename))
+        self._mtimes.update(mtimes)
+        return data
         # except Exception:
         #     raise TemplateFileError(
         #         "The file {} you're trying to include doesn't"
@@ -226,3 +258,95 @@ class Loader(yaml.Loader):
 
     def import_str(self, node):
         return str(self.construct_scalar(node))
+
+
+def _load_yaml_cached(path):
+    """Load a yaml model file, reusing a previous parse when possible.
+
+    The returned model is shared with the cache and must not be modified,
+    the services are copied when they are built from it.
+    """
+    data, mtimes = _load_yaml(os.path.abspath(path))
+    return data
+
+
+def _load_yaml(path):
+    """Return a parsed yaml file and the mtimes of the files it was read from.
+
+    The cached parse of a file is reused as long as neither the file nor
+    any of the files it includes has been modified, so a file included from
+    several places is only parsed once. The file object is handed to the
+    yaml parser, which reads and decodes its bytes itself.
+    """
+    cached = _YAML_CACHE.get(path)
+    if cached is not None:
+        data, mtimes = cached
+        if all(_get_mtime(f) == mtime for f, mtime in mtimes.items()):
+            return cached
+
+    mtimes = {path: _get_mtime(path)}
+    with open(path, 'rb') as f:
+        loader = Loader(f)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+    mtimes.update(loader._mtimes)
+    _YAML_CACHE[path] = (data, mtimes)
+    return data, mtimes
+
+
+def _get_mtime(path):
+    """Return the modification time of a file, None if it can't be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # st_mtime_ns is not available on Python 2.
+    return getattr(stat, 'st_mtime_ns', stat.st_mtime)
+
+
+def _index_by_name(items):
+    """Index a list of dicts by their name property.
+
+    Return the index and the set of names defined more than once. A
+    KeyError is raised if one of the items is missing the name property.
+    """
+    index = {}
+    duplicates = set()
+    for item in items:
+        if item['name'] in index:
+            duplicates.add(item['name'])
+        else:
+            index[item['name']] = item
+    return index, duplicates
+
+
+def _index_hosts(hosts):
+    """Index the Docker Hosts of a cluster by name.
+
+    None is returned when the hosts can't be indexed.
+    """
+    try:
+        return _index_by_name(hosts)
+    except (KeyError, TypeError):
+        return None
+
+
+def _render(data, variables):
+    """Render the jinja2 templates found in the strings of a yaml object."""
+    if isinstance(data, dict):
+        return dict((_render(key, variables), _render(value, variables))
+                    for key, value in data.items())
+    if isinstance(data, list):
+        return [_render(item, variables) for item in data]
+    if isinstance(data, basestring) and '{' in data:
+        return _get_template(data).render(variables)
+    return data
+
+
+def _get_template(source):
+    """Return a compiled jinja2 template, compiling it only once."""
+    if source not in _TEMPLATE_CACHE:
+        _TEMPLATE_CACHE[source] = Template(source)
+    return _TEMPLATE_CACHE[source]
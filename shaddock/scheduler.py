@@ -15,6 +15,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from itertools import groupby
+from multiprocessing.pool import ThreadPool
 from operator import itemgetter
 from shaddock.checks import Checks
 from shaddock.drivers.docker.container import Container
@@ -29,6 +31,7 @@ class Scheduler(object):
         self.model = ModelDefinition(app_args.shdk_model, app_args)
         self.services_list = self.model.get_services_list()
         self.name = name
+        self.build_workers = app_args.shdk_build_workers
         if name is None:
             try:
                 self.services_list.sort(key=itemgetter('priority'))
@@ -41,7 +44,9 @@ class Scheduler(object):
             self.checker = Checks(self.model)
 
     def build(self):
-        if self.name is None:
+        if self.name is None and self.build_workers > 1:
+            self._build_concurrently()
+        elif self.name is None:
             for svc in self.services_list:
                 image = Image(self.model.build_service_dict(svc))
                 image.build()
@@ -49,6 +54,30 @@ class Scheduler(object):
             image = Image(self.model.get_service(self.name))
             image.build()
 
+    def _build_concurrently(self):
+        """Build the images of the services sharing a priority concurrently.
+
+        The priority groups are still built in order, each image of a
+        group only once per Docker host. The hosts are compared on their
+        whole configuration, as a host name is only unique in its cluster.
+        """
+        for priority, services in groupby(self.services_list,
+                                          key=itemgetter('priority')):
+            images = []
+            keys = []
+            for svc in services:
+                cfg = self.model.build_service_dict(svc)
+                key = (cfg['image'], cfg['path'], cfg['api_cfg'])
+                if key not in keys:
+                    keys.append(key)
+                    images.append(cfg)
+            pool = ThreadPool(min(len(images), self.build_workers))
+            try:
+                pool.map(build_image, images)
+            finally:
+                pool.close()
+                pool.join()
+
     def create(self):
         if self.name is None:
             for svc in self.services_list:
@@ -138,5 +167,9 @@ class Scheduler(object):
             self.do_check(check, retry)
 
 
+def build_image(cfg):
+    return Image(cfg).build()
+
+
 class CheckError(Exception):
         pass